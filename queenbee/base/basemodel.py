@@ -1,16 +1,37 @@
-"""Queenbee utility functions."""
+"""Queenbee utility functions.
+
+Models have two hashes. ``sha256`` is the package digest written to repository indexes
+and checked when packages are fetched so it must stay a SHA-256 of the model JSON.
+``__hash__`` is only used for in-memory identity (dict keys, sets) and uses Python's
+built-in hash of the same JSON bytes which is much faster than SHA-256.
+
+Neither hash is cached. Models and their nested lists and dicts can be changed in place
+and there is no reliable way to invalidate a cached serialization, so every call
+serializes the model again.
+"""
+import datetime
 import hashlib
 import json
 from typing import List, Dict
 
 import yaml
+try:
+    from yaml import CSafeDumper as YamlDumper
+except ImportError:
+    # PyYAML was installed without the libyaml bindings
+    from yaml import SafeDumper as YamlDumper
 from pydantic import BaseModel as PydanticBaseModel
 from pydantic import validator, Field, constr
+from pydantic.json import pydantic_encoder
 
-from .parser import parse_file
+from .parser import parse_file, json_loads
 from .variable import get_ref_variable
 
 
+class _YamlDumper(YamlDumper):
+    """Private YAML dumper so the shared PyYAML dumpers are left untouched."""
+
+
 # set up yaml.dump to keep the order of the input dictionary
 # from https://stackoverflow.com/a/31609484/4394669
 def _keep_name_order_in_yaml():
@@ -18,11 +39,57 @@ def _keep_name_order_in_yaml():
         lambda self, data:  self.represent_mapping(
             'tag:yaml.org,2002:map', data.items())
     yaml.add_representer(dict, represent_dict_order)
+    _YamlDumper.add_representer(dict, represent_dict_order)
 
 
 _keep_name_order_in_yaml()
 
 
+def _represent_json_value(dumper, data):
+    """Represent a value in YAML the same way ``json.dumps`` would write it.
+
+    Subclasses of the JSON types (e.g. str enums and urls) are written as their base type
+    and everything else goes through the JSON encoder of the model.
+    """
+    if isinstance(data, str):
+        return dumper.represent_str(str.__str__(data))
+    if isinstance(data, int):
+        return dumper.represent_int(int(data))
+    if isinstance(data, float):
+        return dumper.represent_float(float(data))
+    if isinstance(data, (list, tuple)):
+        return dumper.represent_list(list(data))
+    if isinstance(data, dict):
+        return dumper.represent_data(dict(data))
+    return dumper.represent_data(dumper.json_encoder(data))
+
+
+class _ModelDumper(_YamlDumper):
+    """YAML dumper for the output of ``BaseModel.dict``."""
+
+    json_encoder = staticmethod(pydantic_encoder)
+
+
+_ModelDumper.add_multi_representer(object, _represent_json_value)
+# the safe dumper writes these as YAML timestamps, binary and sets
+for _type in (datetime.date, datetime.datetime, bytes, set):
+    _ModelDumper.add_representer(_type, _represent_json_value)
+
+# one dumper per model class so custom json_encoders in the model Config are applied
+_model_dumpers = {}
+
+
+def _model_dumper(model_class):
+    dumper = _model_dumpers.get(model_class)
+    if dumper is None:
+        dumper = type(
+            f'{model_class.__name__}Dumper', (_ModelDumper,),
+            {'json_encoder': staticmethod(model_class.__json_encoder__)}
+        )
+        _model_dumpers[model_class] = dumper
+    return dumper
+
+
 class BaseModelNoType(PydanticBaseModel):
     """BaseModel with functionality to return the object as a yaml string.
 
@@ -30,6 +97,17 @@ class BaseModelNoType(PydanticBaseModel):
     extensions.
     """
 
+    class Config:
+        json_loads = json_loads
+
+    def _serialized_json(self) -> bytes:
+        """Get the JSON bytes of the model used to compute its hash.
+
+        Returns:
+            bytes -- The UTF-8 encoded JSON string of the model
+        """
+        return self.json(by_alias=True, exclude_unset=False).encode('utf-8')
+
     def yaml(self, exclude_unset=False, **kwargs):
         """Get a YAML string from the model
 
@@ -40,9 +118,18 @@ class BaseModelNoType(PydanticBaseModel):
         Returns:
             str -- A yaml string representing the model
         """
+        if type(self).json is not PydanticBaseModel.json or self.__custom_root_type__:
+            return yaml.dump(
+                json.loads(self.json(by_alias=True,
+                                     exclude_unset=exclude_unset, **kwargs)),
+                Dumper=_YamlDumper,
+                default_flow_style=False
+            )
+
+        # dump the model dictionary directly instead of a round trip through JSON
         return yaml.dump(
-            json.loads(self.json(by_alias=True,
-                                 exclude_unset=exclude_unset, **kwargs)),
+            self.dict(by_alias=True, exclude_unset=exclude_unset, **kwargs),
+            Dumper=_model_dumper(type(self)),
             default_flow_style=False
         )
 
@@ -58,7 +145,7 @@ class BaseModelNoType(PydanticBaseModel):
         Returns:
             dict -- A python dictionary representing the model
         """
-        return json.loads(self.json(by_alias=by_alias, exclude_unset=exclude_unset, **kwargs))
+        return json_loads(self.json(by_alias=by_alias, exclude_unset=exclude_unset, **kwargs))
 
     def to_json(self, filepath, indent=None, **kwargs):
         """Write a JSON file of the model
@@ -105,15 +192,26 @@ class BaseModelNoType(PydanticBaseModel):
         return self.yaml()
 
     @property
-    def __hash__(self):
-        """Return a model hash
+    def sha256(self) -> str:
+        """Return the SHA-256 digest of the model
+
+        This is the digest used to identify packages in a repository index.
 
         Returns:
-            str -- A hash/digest of the model
+            str -- A hex digest of the model JSON representation
         """
-        return hashlib.sha256(
-            self.json(by_alias=True, exclude_unset=False).encode('utf-8')
-        ).hexdigest()
+        return hashlib.sha256(self._serialized_json()).hexdigest()
+
+    def __hash__(self) -> int:
+        # models are mutable so a model must not be changed while it is used as a set
+        # item or a dictionary key
+        return hash(self._serialized_json())
+
+    def __eq__(self, other):
+        # compare the same JSON bytes as __hash__ so equal models always hash the same
+        if isinstance(other, BaseModelNoType):
+            return self._serialized_json() == other._serialized_json()
+        return super(BaseModelNoType, self).__eq__(other)
 
     def _referenced_values(self, var_names: List[str]) -> Dict[str, List[str]]:
         """Get all referenced values specified by var name
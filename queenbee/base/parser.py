@@ -4,6 +4,52 @@ import yaml
 import os
 import re
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson is an optional dependency that decodes JSON several times faster than the
+# standard library. It is only used for reading since the encoded output of the
+# standard library is what package digests are computed from.
+# orjson decodes integers that do not fit in 64 bits as floats. All of them have 20 or
+# more digits so such input is left to the standard library.
+LONG_INTEGER = re.compile(r'\d{20,}')
+LONG_INTEGER_BYTES = re.compile(rb'\d{20,}')
+
+
+def json_loads(data):
+    """Decode a JSON document
+
+    orjson is used when it is installed. Input it would decode differently from the
+    standard library (NaN and Infinity values or integers over 64 bits) is decoded by
+    the standard library instead.
+
+    Arguments:
+        data {Union[str, bytes]} -- The JSON document
+
+    Returns:
+        Any -- The decoded value
+    """
+    if orjson is not None:
+        if isinstance(data, str):
+            long_integer = LONG_INTEGER.search(data)
+        else:
+            long_integer = LONG_INTEGER_BYTES.search(data)
+        if long_integer is None:
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
+                pass
+    return json.loads(data)
+
+# template variables are parsed from every string value of a model so compile the
+# patterns once
+DOUBLE_QUOTES_VARS = re.compile(r"{{\s*([_a-zA-Z0-9.\-\$#\?]*)\s*}}", re.MULTILINE)
+DOUBLE_QUOTE_WORKFLOW_VARS = re.compile(
+    r"{{\s*(workflow\.[_a-zA-Z0-9.\-\$#\?]*)\s*}}", re.MULTILINE
+)
+
 
 def _check_list(lst: list, folder: str):
     """Recursive function to handle import_from inside nested lists."""
@@ -68,8 +114,8 @@ def parse_file(input_file: str) -> dict:
             ext)
 
     if ext == 'json':
-        with open(input_file) as inf:
-            data = json.load(inf)
+        with open(input_file, 'rb') as inf:
+            data = json_loads(inf.read())
     else:
         with open(input_file) as inf:
             data = yaml.safe_load(inf.read())
@@ -91,9 +137,10 @@ def parse_double_quotes_vars(input: str) -> list:
     Returns:
         list -- A list of matched substrings (empty list if None)
     """
-    pattern = r"{{\s*([_a-zA-Z0-9.\-\$#\?]*)\s*}}"
-    match = re.findall(pattern, input, flags=re.MULTILINE)
-    return match
+    # most strings are not templates and can skip the regex scan
+    if '{{' not in input:
+        return []
+    return DOUBLE_QUOTES_VARS.findall(input)
 
 
 def parse_double_quote_workflow_vars(input: str) -> list:
@@ -105,9 +152,9 @@ def parse_double_quote_workflow_vars(input: str) -> list:
     Returns:
         list -- A list of matched substrings (empty list if None)
     """
-    pattern = r"{{\s*(workflow\.[_a-zA-Z0-9.\-\$#\?]*)\s*}}"
-    match = re.findall(pattern, input, flags=re.MULTILINE)
-    return match
+    if '{{' not in input:
+        return []
+    return DOUBLE_QUOTE_WORKFLOW_VARS.findall(input)
 
 
 def replace_double_quote_vars(text: str, key: str, replace: str) -> str:
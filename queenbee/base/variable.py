@@ -1,8 +1,19 @@
 """A collection of methods to handle queenbee referenced variables."""
-from typing import Union
+from functools import lru_cache
+from typing import Union, Tuple
 from .parser import parse_double_quotes_vars
 
 
+@lru_cache(maxsize=4096)
+def _parse_ref_variable(value: Union[bytes, str]) -> Tuple[str]:
+    """Parse referenced variables once for each distinct value.
+
+    The same templates (e.g. "{{inputs.model}}") show up in many models. The result is a
+    tuple so the cached value cannot be changed by callers.
+    """
+    return tuple(parse_double_quotes_vars(value))
+
+
 def get_ref_variable(value: Union[bytes, str]) -> list:
     """Get referenced variable if any
 
@@ -13,7 +24,7 @@ def get_ref_variable(value: Union[bytes, str]) -> list:
     Returns:
         list -- A list of matched substrings (empty list if None)
     """
-    return parse_double_quotes_vars(value)
+    return list(_parse_ref_variable(value))
 
 
 def validate_inputs_outputs_var_format(value: str) -> str:
@@ -1,6 +1,4 @@
 """common objects between different IO files."""
-import collections
-
 from enum import Enum
 from typing import Dict, List, Any
 
@@ -159,8 +157,12 @@ def find_dup_items(values: List) -> List:
     Returns:
         List -- A list of duplicated items
     """
-    dup = [t for t, c in collections.Counter(values).items() if c > 1]
-    return dup
+    # dictionaries keep the first insertion order so duplicates are listed in the
+    # order they first appear
+    seen = {}
+    for value in values:
+        seen[value] = value in seen
+    return [value for value, duplicated in seen.items() if duplicated]
 
 
 def find_io_by_name(input_list: list, name: str):
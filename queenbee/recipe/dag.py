@@ -5,7 +5,7 @@ step indicates what function template should be used and maps inputs and outputs
 specific task.
 """
 from queenbee.io.outputs.task import TaskPathReturn, TaskReturn
-from typing import List, Set, Union
+from typing import List, Set, Union, Dict
 from pydantic import Field, validator, root_validator, constr
 
 from .task import DAGTask
@@ -48,14 +48,15 @@ class DAG(IOBase):
 
     @staticmethod
     def find_task_return(
-        tasks: List[DAGTask],
+        tasks: Union[List[DAGTask], Dict[str, DAGTask]],
         reference: Union[
             TaskReference, TaskFileReference, TaskFolderReference, TaskPathReference]
             ) -> Union[TaskReturn, TaskPathReturn]:
         """Find a task output within the DAG from a reference
 
         Arguments:
-            tasks {List[DAGTask]} -- A list of DAG Tasks
+            tasks {Union[List[DAGTask], Dict[str, DAGTask]]} -- A list of DAG Tasks or a
+                dictionary of DAG Tasks by name
             reference {Union[TaskReference, TaskFileReference, TaskFolderReference,
                 TaskPathReference]} -- A reference to a DAG Task output
 
@@ -66,13 +67,14 @@ class DAG(IOBase):
         Returns:
             Union[TaskReturn, TaskPathReturn] -- A task output parameter or artifact
         """
-        filtered_tasks = [x for x in tasks if x.name == reference.name]
+        if isinstance(tasks, dict):
+            task = tasks.get(reference.name)
+        else:
+            task = next((x for x in tasks if x.name == reference.name), None)
 
-        if not filtered_tasks:
+        if task is None:
             raise ValueError(f'Task with name "{reference.name}" not found.')
 
-        task = filtered_tasks[0]
-
         if isinstance(reference, TaskReference):
             if task.loop is not None:
                 raise ValueError(
@@ -102,7 +104,7 @@ class DAG(IOBase):
     @validator('tasks')
     def check_dependencies(cls, v):
         """Check that all task dependencies exist."""
-        task_names = [task.name for task in v]
+        task_names = set(task.name for task in v)
 
         exceptions = []
         err_msg = 'DAG Task "{name}" has unresolved dependency: "{dep}"\n'
@@ -127,6 +129,8 @@ class DAG(IOBase):
 
         dag_input_names = set(d.name for d in dag_inputs)
 
+        tasks_by_name = {task.name: task for task in v}
+
         exceptions = []
 
         for task in v:
@@ -144,7 +148,7 @@ class DAG(IOBase):
             # Check DAG task inputs
             for arg in task.argument_by_ref_source('task'):
                 try:
-                    cls.find_task_return(tasks=v, reference=arg.from_)
+                    cls.find_task_return(tasks=tasks_by_name, reference=arg.from_)
                 except ValueError as error:
                     exceptions.append(f'tasks.{task.name}.{arg.name}: %s' % error)
 
@@ -182,7 +186,7 @@ class DAG(IOBase):
             # another validation has failed
             return values
 
-        tasks = values['tasks']
+        tasks = {task.name: task for task in values['tasks']}
         outputs = values['outputs']
         exceptions = []
 
@@ -1,12 +1,23 @@
 """Queenbee dependency class."""
-from typing import Dict
+import os
+import threading
+from typing import Dict, Tuple, Any
 from enum import Enum
+from urllib.error import HTTPError
 from pydantic import Field, constr
 
 
 from ..base.basemodel import BaseModel
 from ..base.request import make_request, urljoin, resolve_local_source
 
+# repository indexes fetched in this process keyed by index url. Each value is a tuple
+# of the stamp used to revalidate the entry (the file modification time for local
+# sources or the ETag/Last-Modified request headers for remote ones) and the index.
+# Cached indexes are shared by every dependency on the same source so they must be
+# treated as read-only.
+_INDEX_CACHE: Dict[str, Tuple[Any, 'RepositoryIndex']] = {}
+_INDEX_CACHE_LOCK = threading.Lock()
+
 
 class DependencyKind(str, Enum):
     """Dependency kind."""
@@ -89,27 +100,89 @@ class Dependency(BaseModel):
     def _fetch_index(self, auth_header: Dict[str, str] = {}):
         """Fetch the source repository index object.
 
+        Indexes are cached in memory by url. A cached local index is reused as long as
+        the index file is not modified and a cached remote index is revalidated with
+        the server using its ETag or Last-Modified headers.
+
+        The returned index is shared with other dependencies and threads. It must not
+        be changed.
+
         Returns:
             RepositoryIndex -- A repository index
         """
         from ..repository.index import RepositoryIndex
 
+        with _INDEX_CACHE_LOCK:
+            cached = _INDEX_CACHE.get(self._index_url)
+
         if self.source.startswith('file:'):
-            url = resolve_local_source(self.source) + '/index.json'
+            index_path = os.path.join(
+                resolve_local_source(self.source, as_uri=False), 'index.json')
+            stamp = os.stat(index_path).st_mtime_ns
+            if cached is not None and cached[0] == stamp:
+                return cached[1]
+            res = make_request(url=self._index_url, auth_header=auth_header)
         else:
-            url = urljoin(self.source, 'index.json')
+            headers = dict(auth_header or {})
+            if cached is not None:
+                headers.update(cached[0])
+            try:
+                res = make_request(url=self._index_url, auth_header=headers)
+            except HTTPError as error:
+                if error.code == 304 and cached is not None:
+                    return cached[1]
+                raise error
+            stamp = self._revalidation_headers(res)
+
+        index = RepositoryIndex.parse_raw(res.read())
+
+        with _INDEX_CACHE_LOCK:
+            _INDEX_CACHE[self._index_url] = (stamp, index)
+
+        return index
+
+    @property
+    def _index_url(self) -> str:
+        """The url to the index file of the source repository."""
+        if self.source.startswith('file:'):
+            return resolve_local_source(self.source) + '/index.json'
+        return urljoin(self.source, 'index.json')
+
+    @staticmethod
+    def _revalidation_headers(res) -> Dict[str, str]:
+        """Get the conditional request headers to revalidate a cached response.
 
-        res = make_request(url=url, auth_header=auth_header)
+        Arguments:
+            res {HTTPResponse} -- The response to an index request
 
-        raw_bytes = res.read()
-        return RepositoryIndex.parse_raw(raw_bytes)
+        Returns:
+            Dict[str, str] -- If-None-Match and If-Modified-Since headers based on the
+                ETag and Last-Modified headers of the response
+        """
+        headers = {}
+        res_headers = getattr(res, 'headers', None)
+        if res_headers is None:
+            return headers
 
-    def fetch(self, verify_digest: bool = True, auth_header: Dict[str, str] = {}) -> 'PackageVersion':
+        etag = res_headers.get('ETag')
+        if etag is not None:
+            headers['If-None-Match'] = etag
+
+        last_modified = res_headers.get('Last-Modified')
+        if last_modified is not None:
+            headers['If-Modified-Since'] = last_modified
+
+        return headers
+
+    def fetch(self, verify_digest: bool = True, auth_header: Dict[str, str] = {},
+              index: 'RepositoryIndex' = None) -> 'PackageVersion':
         """Fetch the dependency from its source
 
         Keyword Arguments:
             verify_digest {bool} -- If the dependency is locked, ensure the found
                 manifest matches the saved digest (default: {True})
+            index {RepositoryIndex} -- The index of the source repository if it is
+                already fetched (default: {None})
 
         Raises:
             ValueError: The dependency could not be found or was invalid
@@ -121,8 +194,32 @@ class Dependency(BaseModel):
             str -- The license of the package
         """
 
-        index = self._fetch_index(auth_header=auth_header)
+        if index is None:
+            index = self._fetch_index(auth_header=auth_header)
+
+        package_meta = self._package_version(index)
 
+        return package_meta.fetch_package(
+            source_url=self.source,
+            verify_digest=verify_digest,
+            auth_header=auth_header,
+        )
+
+    def _package_version(self, index: 'RepositoryIndex') -> 'PackageVersion':
+        """Find the package version of the dependency in its source repository index
+
+        The dependency digest is set from the index if it is not locked or if the
+        locked digest is not in the index anymore.
+
+        Arguments:
+            index {RepositoryIndex} -- The index of the source repository
+
+        Raises:
+            ValueError: The dependency could not be found
+
+        Returns:
+            PackageVersion -- The package version of the dependency
+        """
         if self.digest is None:
             package_meta = index.package_by_tag(
                 kind=self.dependency_kind,
@@ -154,8 +251,4 @@ class Dependency(BaseModel):
                 else:
                     raise error
 
-        return package_meta.fetch_package(
-            source_url=self.source,
-            verify_digest=verify_digest,
-            auth_header=auth_header,
-        )
+        return package_meta
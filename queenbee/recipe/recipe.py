@@ -6,6 +6,7 @@ end steps for the recipe.
 import os
 import shutil
 import json
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Union, Dict
 
 import yaml
@@ -22,6 +23,9 @@ from ..plugin.plugin import PluginConfig
 from .dag import DAG, DAGInputs, DAGOutputs
 from .dependency import Dependency, DependencyKind
 
+# maximum number of dependencies that are downloaded at the same time
+MAX_FETCH_WORKERS = 16
+
 
 class TemplateFunction(Function):
     """Function template."""
@@ -47,7 +51,7 @@ class TemplateFunction(Function):
         for function in plugin.functions:
             input_dict = function.to_dict()
             input_dict['type'] = 'TemplateFunction'
-            input_dict['name'] = f'{plugin.__hash__}/{function.name}'
+            input_dict['name'] = f'{plugin.sha256}/{function.name}'
             input_dict['config'] = plugin.config.to_dict()
             functions.append(cls.parse_obj(input_dict))
 
@@ -249,12 +253,65 @@ class Recipe(BaseModel):
 
         return res
 
+    def fetch_dependencies(self, config: Config = Config()) -> List['PackageVersion']:
+        """Fetch the dependencies from their sources
+
+        The index of each source repository is fetched once. Packages are looked up in
+        the indexes in order and only the package downloads run concurrently.
+
+        Keyword Arguments:
+            config {Config} -- A queenbee config object (default: {Config()})
+
+        Returns:
+            List[PackageVersion] -- A list of package versions in the same order as
+                the dependencies
+        """
+        if not self.dependencies:
+            return []
+
+        auth_headers = [
+            config.get_auth_header(repository_url=dependency.source)
+            for dependency in self.dependencies
+        ]
+
+        sources = {}
+        for dependency, auth_header in zip(self.dependencies, auth_headers):
+            sources.setdefault(dependency.source, (dependency, auth_header))
+
+        workers = min(MAX_FETCH_WORKERS, len(self.dependencies))
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            indexes = dict(zip(
+                sources,
+                executor.map(
+                    lambda item: item[0]._fetch_index(auth_header=item[1]),
+                    sources.values()
+                )
+            ))
+
+            # look up the packages in one thread since the index objects are shared
+            # and only download the packages concurrently
+            package_versions = [
+                dependency._package_version(indexes[dependency.source])
+                for dependency in self.dependencies
+            ]
+
+            futures = [
+                executor.submit(
+                    package_version.fetch_package,
+                    source_url=dependency.source,
+                    auth_header=auth_header
+                )
+                for dependency, package_version, auth_header in zip(
+                    self.dependencies, package_versions, auth_headers
+                )
+            ]
+
+            return [future.result() for future in futures]
+
     def lock_dependencies(self, config: Config = Config()):
         """Lock the dependencies by fetching them and storing their digest"""
-        for dependency in self.dependencies:
-            auth_header = config.get_auth_header(
-                repository_url=dependency.source)
-            dependency.fetch(auth_header=auth_header)
+        self.fetch_dependencies(config=config)
 
     def write_dependency_file(self, folder_path: str):
         """Write the locked dependencies to a Recipe folder
@@ -353,10 +410,9 @@ class Recipe(BaseModel):
         if not os.path.isdir(recipes_folder):
             os.makedirs(recipes_folder, exist_ok=True)
 
-        for dependency in self.dependencies:
-            auth_header = config.get_auth_header(
-                repository_url=dependency.source)
-            package_version = dependency.fetch(auth_header=auth_header)
+        package_versions = self.fetch_dependencies(config=config)
+
+        for dependency, package_version in zip(self.dependencies, package_versions):
             dep = package_version.manifest
 
             if dependency.kind == DependencyKind.recipe:
@@ -409,7 +465,7 @@ class BakedRecipe(Recipe):
 
         recipe = recipe.copy(deep=True)
 
-        digest = recipe.__hash__
+        digest = recipe.sha256
 
         digest_dict = {
             '__self__': digest
@@ -417,10 +473,9 @@ class BakedRecipe(Recipe):
 
         templates = []
 
-        for dependency in recipe.dependencies:
-            auth_header = config.get_auth_header(
-                repository_url=dependency.source)
-            package_version = dependency.fetch(auth_header=auth_header)
+        package_versions = recipe.fetch_dependencies(config=config)
+
+        for dependency, package_version in zip(recipe.dependencies, package_versions):
             dep = package_version.manifest
 
             if dependency.kind == DependencyKind.recipe:
@@ -432,7 +487,7 @@ class BakedRecipe(Recipe):
 
             elif dependency.kind == DependencyKind.plugin:
                 templates.extend(TemplateFunction.from_plugin(dep))
-                digest_dict[dependency.ref_name] = dep.__hash__
+                digest_dict[dependency.ref_name] = dep.sha256
 
             else:
                 raise ValueError(
@@ -489,7 +544,7 @@ class BakedRecipe(Recipe):
 
         recipe = Recipe.from_folder(folder_path)
 
-        digest = recipe.__hash__
+        digest = recipe.sha256
 
         digest_dict = {
             '__self__': digest
@@ -515,7 +570,7 @@ class BakedRecipe(Recipe):
                     )
                 )
                 templates.extend(TemplateFunction.from_plugin(plugin))
-                digest_dict[plugin_dep_name] = plugin.__hash__
+                digest_dict[plugin_dep_name] = plugin.sha256
 
         recipes_folder = os.path.join(dependencies_folder, 'recipe')
         if os.path.isdir(recipes_folder):
@@ -630,11 +685,11 @@ class BakedRecipe(Recipe):
     @validator('templates')
     def remove_duplicates(cls, v):
         """Remove duplicated templates by name"""
-        temp_names = []
+        temp_names = set()
         templates = []
         for template in v:
             if template.name not in temp_names:
-                temp_names.append(template.name)
+                temp_names.add(template.name)
                 templates.append(template)
 
         return templates
@@ -647,9 +702,16 @@ class BakedRecipe(Recipe):
 
         all_templates = templates + flow
 
+        # look up templates by name once instead of scanning the list for every task
+        templates_by_name = {}
+        for template in all_templates:
+            templates_by_name.setdefault(template.name, template)
+
         for dag in flow:
             for task in dag.tasks:
-                template = cls.template_by_name(all_templates, task.template)
+                template = templates_by_name.get(task.template)
+                if template is None:
+                    template = cls.template_by_name(all_templates, task.template)
                 task.check_template(template)
 
         return values
@@ -1,14 +1,20 @@
 import os
-from typing import List, Union, Dict
+import sys
+import pickle
+import shutil
+import hashlib
+import tempfile
+from typing import List, Union, Dict, Tuple
 from datetime import datetime
-from pydantic import Field, root_validator, validator, constr
+from pydantic import Field, root_validator, validator, constr, PrivateAttr
+from pydantic import VERSION as PYDANTIC_VERSION
 
 from ..base.basemodel import BaseModel
 
 from ..plugin import Plugin
 from ..recipe import Recipe
 
-from .package import PackageVersion
+from .package import PackageVersion, cache_folder, is_private_folder, write_to_cache
 
 
 class RepositoryMetadata(BaseModel):
@@ -69,6 +75,10 @@ class RepositoryIndex(BaseModel):
         ' list of recipesversions'
     )
 
+    # (name, tag) and (name, digest) lookups of package versions for each kind of
+    # package
+    _lookups: dict = PrivateAttr(default_factory=dict)
+
     @validator('plugin')
     def set_plugin_type(cls, v):
         for _, package in v.items():
@@ -134,20 +144,26 @@ class RepositoryIndex(BaseModel):
         recipes_folder = os.path.join(folder_path, 'recipes')
 
         if os.path.exists(plugins_folder):
-            for package in os.listdir(plugins_folder):
-                package_path = os.path.join(folder_path, 'plugins', package)
-                resource_version = PackageVersion.from_package(package_path)
-                resource_version.url = \
-                    os.path.join('plugins', package).replace('\\', '/')
-                index.index_plugin_version(resource_version)
+            with os.scandir(plugins_folder) as entries:
+                for entry in entries:
+                    if not entry.is_file():
+                        continue
+                    resource_version = PackageVersion.from_package(entry.path)
+                    resource_version.url = f'plugins/{entry.name}'
+                    index.index_plugin_version(
+                        resource_version, update_generated=False
+                    )
 
         if os.path.exists(recipes_folder):
-            for package in os.listdir(recipes_folder):
-                package_path = os.path.join(folder_path, 'recipes', package)
-                resource_version = PackageVersion.from_package(package_path)
-                resource_version.url = \
-                    os.path.join('recipes', package).replace('\\', '/')
-                index.index_recipe_version(resource_version)
+            with os.scandir(recipes_folder) as entries:
+                for entry in entries:
+                    if not entry.is_file():
+                        continue
+                    resource_version = PackageVersion.from_package(entry.path)
+                    resource_version.url = f'recipes/{entry.name}'
+                    index.index_recipe_version(
+                        resource_version, update_generated=False
+                    )
 
         index.generated = datetime.utcnow()
 
@@ -166,13 +182,98 @@ class RepositoryIndex(BaseModel):
 
         return index
 
+    @classmethod
+    def from_file(cls, filepath):
+        """Create an index from a file
+
+        Parsed indexes are pickled to a local cache so loading an unchanged index file
+        again skips parsing and validation. Cache entries are keyed by the file path,
+        modification time and size.
+
+        As a side effect this writes the parsed index to ``~/.queenbee/cache/index`` (or
+        the folder set by the ``QUEENBEE_CACHE_DIR`` environment variable). Loading a
+        pickle runs code so the cache is only used if the folder is private to the
+        current user (see ``is_private_folder``).
+
+        Arguments:
+            filepath {str} -- Path to the file to read (can be JSON or YAML)
+
+        Returns:
+            RepositoryIndex -- A repository index
+        """
+        filepath = os.path.abspath(filepath)
+        cache_path = cls._cache_path(filepath)
+
+        if os.path.isfile(cache_path) and \
+                is_private_folder(os.path.dirname(cache_path)):
+            try:
+                with open(cache_path, 'rb') as f:
+                    index = pickle.load(f)
+                if isinstance(index, cls):
+                    return index
+            except Exception:
+                pass
+
+        index = super(RepositoryIndex, cls).from_file(filepath)
+        index._write_cache(filepath)
+
+        return index
+
+    def _write_cache(self, filepath: str):
+        """Store the index in the cache as the parsed version of an index file
+
+        Arguments:
+            filepath {str} -- Absolute path to the index file the index was read from or
+                written to
+        """
+        cache_path = self._cache_path(filepath)
+        cache_folder, cache_name = os.path.split(cache_path)
+        if os.path.exists(cache_folder) and not is_private_folder(cache_folder):
+            # the cache would never be read
+            return
+        write_to_cache(cache_path, pickle.dumps(self, pickle.HIGHEST_PROTOCOL))
+
+        # remove cache entries for older versions of the same file
+        path_key = cache_name.split('-')[0]
+        try:
+            for entry in os.listdir(cache_folder):
+                if entry.startswith(path_key) and entry != cache_name:
+                    os.remove(os.path.join(cache_folder, entry))
+        except OSError:
+            pass
+
+    @staticmethod
+    def _cache_path(filepath: str) -> str:
+        """Get the path to the cached version of an index file
+
+        The key includes the pydantic version and the modification time of the modules
+        that define the pickled classes so the cache is dropped when they change.
+
+        Arguments:
+            filepath {str} -- Absolute path to an index file
+
+        Returns:
+            str -- Path to the pickled index in the index cache folder
+        """
+        stat = os.stat(filepath)
+        modules = (__name__, PackageVersion.__module__, BaseModel.__module__)
+        stamp = [str(stat.st_mtime_ns), str(stat.st_size), PYDANTIC_VERSION]
+        stamp.extend(
+            str(os.stat(sys.modules[module].__file__).st_mtime_ns) for module in modules
+        )
+
+        path_key = hashlib.blake2b(filepath.encode('utf-8'), digest_size=16).hexdigest()
+        stamp_key = hashlib.blake2b(
+            '-'.join(stamp).encode('utf-8'), digest_size=16).hexdigest()
+
+        return os.path.join(cache_folder('index'), f'{path_key}-{stamp_key}.pickle')
+
     @classmethod
     def index_resource(
         cls,
         index_folder: str,
         resource: Union[Plugin, Recipe],
         readme: str = None,
-        license: str = None,
         overwrite: bool = False,
     ):
         """Package a plugin or Workflow and add it to an existing index.json file
@@ -184,8 +285,6 @@ class RepositoryIndex(BaseModel):
         Keyword Arguments:
             readme {str} -- Text of the recipe README.md file if it exists
                 (default: {None})
-            license {str} -- Text of the resource LICENSE file if it exists
-                (default: {None})
             overwrite {bool} -- Indicate whether overwriting an existing package or
                 index entry is allowed (default: {False})
 
@@ -209,22 +308,46 @@ class RepositoryIndex(BaseModel):
         resource_version, file_object = PackageVersion.package_resource(
             resource=resource,
             readme=readme,
-            license=license,
         )
 
         tar_path = os.path.join(index_folder, type_path, resource_version.url)
 
+        # the index file does not keep these fields so leave them out of the index in
+        # memory as well. It then matches the written file and can be cached as is.
+        index_version = resource_version.copy(
+            update={'readme': None, 'license': None, 'manifest': None}
+        )
+        if index.metadata.name is not None:
+            # parsing the written file adds the slug so add it here too
+            cls.add_slugs(
+                root=index.metadata.name,
+                packages={index_version.name: [index_version]}
+            )
+
         if isinstance(resource, Plugin):
-            index.index_plugin_version(resource_version, overwrite)
+            index.index_plugin_version(index_version, overwrite)
         elif isinstance(resource, Recipe):
-            index.index_recipe_version(resource_version, overwrite)
+            index.index_recipe_version(index_version, overwrite)
+
+        index.metadata.plugin_count = len(index.plugin)
+        index.metadata.recipe_count = len(index.recipe)
 
         # Write packaged version to repo directory
         with open(tar_path, 'wb') as f:
             file_object.seek(0)
             f.write(file_object.read())
 
-        index.to_json(index_path)
+        # write to a temporary file and move it in place so a failed write never leaves
+        # a truncated index behind
+        with tempfile.NamedTemporaryFile(
+            'w', dir=index_folder, suffix='.json', delete=False
+        ) as f:
+            f.write(index.json(by_alias=True, exclude_unset=False))
+        shutil.copymode(index_path, f.name)
+        os.replace(f.name, index_path)
+
+        # the next update of this index reads it from the cache instead of parsing it
+        index._write_cache(index_path)
 
     @staticmethod
     def add_slugs(root: str, packages: Dict[str, List[PackageVersion]]):
@@ -251,21 +374,55 @@ class RepositoryIndex(BaseModel):
         if package_versions == []:
             return None
 
-        package_versions.sort(key=lambda x: x.created)
-        return package_versions[-1]
+        # do not sort the list in place since indexes can be shared between threads.
+        # The last of several versions created at the same time is the latest one.
+        return max(reversed(package_versions), key=lambda x: x.created)
+
+    def _package_index(
+        self, kind: str, attribute: str = 'tag'
+    ) -> Dict[Tuple[str, str], PackageVersion]:
+        """Get a lookup of package versions by name and tag or digest
+
+        The lookup is built on first use and rebuilt if the package dict is replaced.
+        Package versions should be added using ``index_plugin_version`` and
+        ``index_recipe_version`` to keep it in sync with the index.
+
+        Arguments:
+            kind {str} -- The type of package (plugin or recipe)
+
+        Keyword Arguments:
+            attribute {str} -- The package version attribute to use in the lookup keys
+                (tag or digest) (default: {'tag'})
+
+        Returns:
+            Dict[Tuple[str, str], PackageVersion] -- A dictionary of package versions
+                keyed by package name and the attribute value
+        """
+        package_dict = getattr(self, kind)
+        cached = self._lookups.get((kind, attribute))
+
+        if cached is None or cached[0] is not package_dict:
+            # keep the first match in list order like a linear search would
+            lookup = {}
+            for name, package_list in package_dict.items():
+                for package in package_list:
+                    lookup.setdefault((name, getattr(package, attribute)), package)
+            cached = (package_dict, lookup)
+            self._lookups[(kind, attribute)] = cached
+
+        return cached[1]
 
-    @staticmethod
     def _index_resource_version(
-        resource_dict: Dict[str, List[PackageVersion]],
+        self,
+        kind: str,
         resource_version: PackageVersion,
         repository_name: str = None,
         overwrite: bool = False,
-    ) -> Dict[str, List[PackageVersion]]:
-        """Add a resource version to an index of resource versions
+    ):
+        """Add a resource version to the index
 
         Arguments:
-            resource_dict {Dict[str, List[PackageVersion]]} -- An
-                index of resource versions
+            kind {str} -- The type of package (plugin or recipe)
             resource_version {PackageVersion} -- The resource
                 version to add
 
@@ -277,41 +434,51 @@ class RepositoryIndex(BaseModel):
 
         Raises:
             ValueError: Resource version already exists
-
-        Returns:
-            Dict[str, List[PackageVersion]] -- A resource version
-                index
         """
         if repository_name:
             resource_version.slug = f'{repository_name.lower()}/{resource_version.name.lower()}'
 
-        resource_list = resource_dict.get(resource_version.name, [])
+        package_dict = getattr(self, kind)
+        lookup = self._package_index(kind)
+        digest_lookup = self._package_index(kind, 'digest')
+        key = (resource_version.name, resource_version.tag)
+        match = lookup.get(key)
 
-        if not overwrite:
-            match = next(
-                filter(
-                    lambda x: x.tag == resource_version.tag, resource_list
-                ), None
-            )
-            if match is not None:
+        resource_list = package_dict.setdefault(resource_version.name, [])
+
+        if match is not None:
+            if not overwrite:
                 if match.digest != resource_version.digest:
                     raise ValueError(
                         f'Resource {resource_version.name} already has a version'
                         f' {resource_version.tag} in the index'
                     )
-                return resource_dict
+                return
 
-        resource_list = list(
-            filter(lambda x: x.tag != resource_version.tag, resource_list)
-        )
+            removed_digests = set(
+                x.digest for x in resource_list if x.tag == resource_version.tag
+            )
+            resource_list[:] = [
+                x for x in resource_list if x.tag != resource_version.tag
+            ]
+
+            # several tags can share a digest so point the digest entries of the removed
+            # versions to the first remaining version with the same digest
+            for digest in removed_digests:
+                digest_lookup.pop((resource_version.name, digest), None)
+            for x in resource_list:
+                if x.digest in removed_digests:
+                    digest_lookup.setdefault((resource_version.name, x.digest), x)
 
         resource_list.append(resource_version)
-        resource_dict[resource_version.name] = resource_list
-
-        return resource_dict
+        lookup[key] = resource_version
+        digest_lookup.setdefault(
+            (resource_version.name, resource_version.digest), resource_version
+        )
 
     def index_recipe_version(self, recipe_version: PackageVersion,
-                             overwrite: bool = False):
+                             overwrite: bool = False,
+                             update_generated: bool = True):
         """Add a Recipe Version to an Index of Recipes
 
         Arguments:
@@ -320,14 +487,18 @@ class RepositoryIndex(BaseModel):
         Keyword Arguments:
             overwrite {bool} -- Overwrite the Recipe Version if it already exists in the
                 index (default: {False})
+            update_generated {bool} -- Set the generated time of the index. Bulk updates
+                turn this off and set it once at the end (default: {True})
         """
-        self.recipe = self._index_resource_version(
-            self.recipe, recipe_version, overwrite=overwrite
+        self._index_resource_version(
+            'recipe', recipe_version, overwrite=overwrite
         )
-        self.generated = datetime.utcnow()
+        if update_generated:
+            self.generated = datetime.utcnow()
 
     def index_plugin_version(self, plugin_version: PackageVersion,
-                               overwrite: bool = False):
+                               overwrite: bool = False,
+                               update_generated: bool = True):
         """Add a Plugin Version to an Index of Plugins
 
         Arguments:
@@ -336,11 +507,14 @@ class RepositoryIndex(BaseModel):
         Keyword Arguments:
             overwrite {bool} -- Overwrite the Plugin Version if it already exists in
                 the index (default: {False})
+            update_generated {bool} -- Set the generated time of the index. Bulk updates
+                turn this off and set it once at the end (default: {True})
         """
-        self.plugin = self._index_resource_version(
-            self.plugin, plugin_version, overwrite=overwrite
+        self._index_resource_version(
+            'plugin', plugin_version, overwrite=overwrite
         )
-        self.generated = datetime.utcnow()
+        if update_generated:
+            self.generated = datetime.utcnow()
 
     def merge_folder(self, folder_path, overwrite: bool = False, skip: bool = False):
         """Merge the contents of a repository folder with the index
@@ -355,31 +529,39 @@ class RepositoryIndex(BaseModel):
         Raises:
             ValueError: Resource version already exists or is invalid
         """
-        for package in os.listdir(os.path.join(folder_path, 'plugins')):
-            package_path = os.path.join(folder_path, 'plugins', package)
-            resource_version = PackageVersion.from_package(package_path)
-            resource_version.url = \
-                    os.path.join('plugins', package).replace('\\', '/')
-            try:
-                self.index_plugin_version(resource_version, overwrite)
-            except ValueError as error:
-                if 'already has a version ' in str(error):
-                    if skip:
-                        continue
-                raise error
+        with os.scandir(os.path.join(folder_path, 'plugins')) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                resource_version = PackageVersion.from_package(entry.path)
+                resource_version.url = f'plugins/{entry.name}'
+                try:
+                    self.index_plugin_version(
+                        resource_version, overwrite, update_generated=False
+                    )
+                except ValueError as error:
+                    if 'already has a version ' in str(error):
+                        if skip:
+                            continue
+                    raise error
+
+        with os.scandir(os.path.join(folder_path, 'recipes')) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                resource_version = PackageVersion.from_package(entry.path)
+                resource_version.url = f'recipes/{entry.name}'
+                try:
+                    self.index_recipe_version(
+                        resource_version, overwrite, update_generated=False
+                    )
+                except ValueError as error:
+                    if 'already has a version ' in str(error):
+                        if skip:
+                            continue
+                    raise error
 
-        for package in os.listdir(os.path.join(folder_path, 'recipes')):
-            package_path = os.path.join(folder_path, 'recipes', package)
-            resource_version = PackageVersion.from_package(package_path)
-            resource_version.url = \
-                    os.path.join('recipes', package).replace('\\', '/')
-            try:
-                self.index_recipe_version(resource_version, overwrite)
-            except ValueError as error:
-                if 'already has a version ' in str(error):
-                    if skip:
-                        continue
-                raise error
+        self.generated = datetime.utcnow()
 
     def package_by_tag(
         self,
@@ -416,7 +598,7 @@ class RepositoryIndex(BaseModel):
         if package_tag == 'latest':
             return self.get_latest(package_versions=package_list)
 
-        res = next(filter(lambda x: x.tag == package_tag, package_list), None)
+        res = self._package_index(kind).get((package_name, package_tag))
 
         if res is None:
             raise ValueError(
@@ -455,8 +637,7 @@ class RepositoryIndex(BaseModel):
                 f' in this index'
             )
 
-        res = next(filter(lambda x: x.digest ==
-                          package_digest, package_list), None)
+        res = self._package_index(kind, 'digest').get((package_name, package_digest))
 
         if res is None:
             raise ValueError(
@@ -1,10 +1,13 @@
 import os
 import re
+import stat
 import hashlib
-from io import BytesIO
+import tempfile
+from io import BytesIO, RawIOBase
+from pathlib import Path
 from datetime import datetime
 from tarfile import TarInfo, TarFile
-from typing import Union, Tuple, Dict
+from typing import Union, Tuple, Dict, BinaryIO
 
 from pydantic import Field, constr
 
@@ -13,6 +16,16 @@ from ..recipe import Recipe, BakedRecipe
 
 from ..base.request import make_request, urljoin, resolve_local_source
 from ..base.metadata import MetaData
+from ..base.parser import json_loads
+
+# size of the blocks read from a package tar member while its digest is computed
+READ_CHUNK_SIZE = 64 * 1024
+
+# package digests are used as cache file names
+DIGEST_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+# environment variable to set the root folder of the local caches
+CACHE_FOLDER_ENV = 'QUEENBEE_CACHE_DIR'
 
 
 def reset_tar(tarinfo: TarInfo) -> TarInfo:
@@ -33,6 +46,155 @@ def add_to_tar(tar: TarFile, data: bytes, filename: str):
     tar.addfile(tarinfo, BytesIO(data))
 
 
+def cache_folder(name: str) -> str:
+    """Get the path to a local cache folder
+
+    Caches are stored under ``~/.queenbee/cache`` unless the ``QUEENBEE_CACHE_DIR``
+    environment variable is set to another folder.
+
+    Arguments:
+        name {str} -- The name of the cache (e.g. packages or index)
+
+    Returns:
+        str -- Path to the cache folder
+    """
+    root = os.environ.get(CACHE_FOLDER_ENV) or \
+        os.path.join(Path.home(), '.queenbee', 'cache')
+    return os.path.join(root, name)
+
+
+def is_private_folder(folder: str) -> bool:
+    """Check that no other user can write to a cache folder
+
+    On POSIX systems the folder must be owned by the current user and closed to group
+    and others. Where file ownership is not available only folders under the user home
+    folder are trusted.
+
+    Arguments:
+        folder {str} -- Path to the folder
+
+    Returns:
+        bool -- True if the folder exists and is private to the current user
+    """
+    try:
+        folder_stat = os.stat(folder)
+    except OSError:
+        return False
+    if hasattr(os, 'getuid'):
+        return folder_stat.st_uid == os.getuid() and \
+            stat.S_IMODE(folder_stat.st_mode) & 0o077 == 0
+    return Path.home().resolve() in Path(folder).resolve().parents
+
+
+def write_to_cache(cache_path: str, data: bytes):
+    """Write a file to a local cache folder
+
+    The data is written to a temporary file first and then moved in place so concurrent
+    writes of the same file never leave a partial file behind. New cache folders are only
+    accessible to the current user. Failing to write the cache is not an error.
+
+    Arguments:
+        cache_path {str} -- Path to the cached file
+        data {bytes} -- The file content
+    """
+    folder = os.path.dirname(cache_path)
+    try:
+        os.makedirs(folder, mode=0o700, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=folder, delete=False) as f:
+            f.write(data)
+        os.replace(f.name, cache_path)
+    except OSError:
+        pass
+
+
+class HashingReader(RawIOBase):
+    """A readable stream that computes the SHA-256 digest of the data read through it
+
+    Arguments:
+        stream {BinaryIO} -- The stream to read from
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.hasher = hashlib.sha256()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self.stream.read(len(buffer))
+        size = len(data)
+        buffer[:size] = data
+        self.hasher.update(data)
+        return size
+
+    def hexdigest(self) -> str:
+        """The hex digest of the data read so far"""
+        return self.hasher.hexdigest()
+
+
+class CachingReader(RawIOBase):
+    """A readable stream that copies the data read through it to a cache file
+
+    The data is written to a temporary file which is only moved in place by ``commit``.
+    Failing to write the cache is not an error.
+
+    Arguments:
+        stream {BinaryIO} -- The stream to read from
+        cache_path {str} -- Path to the cached file
+    """
+
+    def __init__(self, stream, cache_path: str):
+        self.stream = stream
+        self.cache_path = cache_path
+        folder = os.path.dirname(cache_path)
+        try:
+            os.makedirs(folder, mode=0o700, exist_ok=True)
+            self.cache_file = tempfile.NamedTemporaryFile(dir=folder, delete=False)
+        except OSError:
+            self.cache_file = None
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self.stream.read(len(buffer))
+        size = len(data)
+        buffer[:size] = data
+        if self.cache_file is not None:
+            try:
+                self.cache_file.write(data)
+            except OSError:
+                self.discard()
+        return size
+
+    def commit(self):
+        """Read the rest of the stream and move the cache file in place"""
+        if self.cache_file is None:
+            return
+        while self.read(READ_CHUNK_SIZE):
+            pass
+        if self.cache_file is None:
+            return
+        try:
+            self.cache_file.close()
+            os.replace(self.cache_file.name, self.cache_path)
+            self.cache_file = None
+        except OSError:
+            self.discard()
+
+    def discard(self):
+        """Remove the temporary cache file if it was not committed"""
+        if self.cache_file is None:
+            return
+        cache_file, self.cache_file = self.cache_file, None
+        try:
+            cache_file.close()
+            os.remove(cache_file.name)
+        except OSError:
+            pass
+
+
 class PackageVersion(MetaData):
     """Package Version
 
@@ -96,7 +258,7 @@ class PackageVersion(MetaData):
 
         input_dict = resource.metadata.to_dict()
         input_dict['type'] = 'PackageVersion'
-        input_dict['digest'] = resource.__hash__
+        input_dict['digest'] = resource.sha256
         input_dict['created'] = created
         input_dict['url'] = package_path
 
@@ -180,30 +342,64 @@ class PackageVersion(MetaData):
     @classmethod
     def unpack_tar(
         cls,
-        tar_file: BytesIO,
+        tar_file: BinaryIO,
         verify_digest: bool = True,
         digest: str = None
     ) -> 'PackageVersion':
+        version, _ = cls._read_tar(
+            tar_file=tar_file, verify_digest=verify_digest, digest=digest
+        )
+        return version
+
+    @classmethod
+    def _read_tar(
+        cls,
+        tar_file: BinaryIO,
+        verify_digest: bool = True,
+        digest: str = None
+    ) -> Tuple['PackageVersion', str]:
+        """Read a package version from a package tar file
 
-        tar = TarFile.open(fileobj=tar_file)
+        Arguments:
+            tar_file {BinaryIO} -- A readable stream of the gzipped tar file
+
+        Keyword Arguments:
+            verify_digest {bool} -- Raise an error if the digest of the resource.json file
+                is not the expected digest (default: {True})
+            digest {str} -- The expected digest (default: {None})
+
+        Returns:
+            PackageVersion -- A package version object
+            str -- The SHA-256 digest computed from the resource.json file
+        """
+        # read the archive as a stream so the package does not need to be held in memory
+        # or seeked. Members must then be read in the order they come in.
+        tar = TarFile.open(fileobj=tar_file, mode='r|*')
 
         manifest_bytes = None
         version = None
         readme_string = None
         read_digest = None
 
-        for member in tar.getmembers():
+        for member in tar:
             if member.name == 'resource.json':
-                manifest_bytes = tar.extractfile(member).read()
-                read_digest = hashlib.sha256(manifest_bytes).hexdigest()
-
-                if verify_digest:
-                    read_digest == digest, \
-                        ValueError(
-                            f'Hash of resource.json file is different from the one'
-                            f' expected from the index Expected {digest} but got'
-                            f' {read_digest}'
-                        )
+                reader = HashingReader(tar.extractfile(member))
+                chunks = []
+                while True:
+                    chunk = reader.read(READ_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    chunks.append(chunk)
+                manifest_bytes = b''.join(chunks)
+                read_digest = reader.hexdigest()
+
+                # fail before reading the rest of the package
+                if verify_digest and digest is not None and read_digest != digest:
+                    raise ValueError(
+                        f'Hash of resource.json file is different from the one'
+                        f' expected from the index Expected {digest} but got'
+                        f' {read_digest}'
+                    )
             elif member.name == 'version.json':
                 version = cls.parse_raw(tar.extractfile(member).read())
             elif member.name == 'README.md':
@@ -216,21 +412,38 @@ class PackageVersion(MetaData):
             )
 
         try:
-            manifest = Plugin.parse_raw(manifest_bytes)
-            version.kind = 'plugin'
-        except Exception as error:
+            manifest_data = json_loads(manifest_bytes)
+            manifest_type = manifest_data.get('type')
+        except Exception:
+            raise ValueError(
+                'Package resource.json could not be read as a Recipe or a plugin')
+
+        # validate the manifest once against the class its type points to
+        if manifest_type == 'Recipe':
+            kinds = [(Recipe, 'recipe')]
+        elif manifest_type == 'Plugin':
+            kinds = [(Plugin, 'plugin')]
+        else:
+            kinds = [(Plugin, 'plugin'), (Recipe, 'recipe')]
+
+        manifest = None
+        for klass, kind in kinds:
             try:
-                manifest = Recipe.parse_raw(manifest_bytes)
-                version.kind = 'recipe'
-            except Exception as error:
-                raise ValueError(
-                    'Package resource.json could not be read as a Recipe or a plugin')
+                manifest = klass.parse_obj(manifest_data)
+            except Exception:
+                continue
+            version.kind = kind
+            break
+
+        if manifest is None:
+            raise ValueError(
+                'Package resource.json could not be read as a Recipe or a plugin')
 
         version.manifest = manifest
         version.readme = readme_string
         version.digest = read_digest
 
-        return version
+        return version, read_digest
 
     @classmethod
     def from_package(cls, package_path: str):
@@ -248,9 +461,7 @@ class PackageVersion(MetaData):
             file_path = package_path.replace('\\', '/')
 
         with open(file_path, 'rb') as f:
-            filebytes = BytesIO(f.read())
-
-        version = cls.unpack_tar(tar_file=filebytes, verify_digest=False)
+            version = cls.unpack_tar(tar_file=f, verify_digest=False)
 
         return version
 
@@ -264,15 +475,51 @@ class PackageVersion(MetaData):
 
         package_url = urljoin(source_url, self.url)
 
+        # the digest comes from a remote index so only use it in a file name if it is an
+        # actual SHA-256 hex digest
+        if self.digest is None or not DIGEST_PATTERN.match(self.digest):
+            res = make_request(url=package_url, auth_header=auth_header)
+            return self.unpack_tar(
+                tar_file=res,
+                verify_digest=verify_digest,
+                digest=self.digest
+            )
+
+        # packages downloaded from remote repositories are cached by digest
+        cache_path = os.path.join(cache_folder('packages'), f'{self.digest}.tgz')
+
+        if os.path.isfile(cache_path):
+            try:
+                with open(cache_path, 'rb') as f:
+                    version, read_digest = self._read_tar(
+                        tar_file=f,
+                        verify_digest=verify_digest,
+                        digest=self.digest
+                    )
+            except Exception:
+                read_digest = None
+
+            if read_digest == self.digest:
+                return version
+
         res = make_request(url=package_url, auth_header=auth_header)
 
-        filebytes = BytesIO(res.read())
+        # unpack the package while it is downloaded and copy it to the cache on the way.
+        # It is only cached if the digest computed from its resource.json file matches.
+        reader = CachingReader(res, cache_path)
+        try:
+            version, read_digest = self._read_tar(
+                tar_file=reader,
+                verify_digest=verify_digest,
+                digest=self.digest
+            )
+
+            if read_digest == self.digest:
+                reader.commit()
+        finally:
+            reader.discard()
 
-        return self.unpack_tar(
-            tar_file=filebytes,
-            verify_digest=verify_digest,
-            digest=self.digest
-        )
+        return version
 
     @staticmethod
     def read_readme(folder_path: str) -> str:
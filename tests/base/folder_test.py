@@ -37,4 +37,4 @@ class BaseFolderTest(BaseTestClass):
         parsed_instance = self.klass.from_folder(folder)
 
         assert parsed_instance == instance
-        assert parsed_instance.__hash__ == instance.__hash__
+        assert parsed_instance.sha256 == instance.sha256
@@ -15,4 +15,5 @@ class BaseHashTest(BaseTestClass):
     def test_generates_hash(self, instance):
         """Test to check for bug introduced in Pydantic 1.8"""
         
-        assert instance.__hash__ is not None
+        assert instance.sha256 is not None
+        assert hash(instance) == hash(instance.copy())
@@ -60,7 +60,7 @@ class BaseIOTest(BaseTestClass):
 
         assert obj == valid_instance.to_dict()
         assert self.klass.from_file(
-            loc_file).__hash__ == valid_instance.__hash__
+            loc_file).sha256 == valid_instance.sha256
 
     def test_to_json(self, valid_dict):
         valid_instance = self.klass.parse_obj(valid_dict)
@@ -74,4 +74,4 @@ class BaseIOTest(BaseTestClass):
 
         assert obj == valid_instance.to_dict()
         assert self.klass.from_file(
-            loc_file).__hash__ == valid_instance.__hash__
+            loc_file).sha256 == valid_instance.sha256
@@ -23,3 +23,10 @@ def mock_repository_url(monkeypatch):
         return open(file_path, 'rb')
 
     monkeypatch.setattr(request, 'urlopen', urlopen_mock)
+
+
+@pytest.fixture(autouse=True)
+def cache_folder(tmp_path, monkeypatch):
+    path = tmp_path / 'cache'
+    monkeypatch.setenv('QUEENBEE_CACHE_DIR', str(path))
+    return path
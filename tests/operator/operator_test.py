@@ -1,3 +1,4 @@
+import math
 import yaml
 from tests.base.io_test import BaseIOTest
 from tests.base.value_error import BaseValueErrorTest
@@ -5,6 +6,7 @@ from tests.base.folder_test import BaseFolderTest
 from tests.base.hash_test import BaseHashTest
 
 from queenbee.plugin import Plugin
+from queenbee.io.inputs.job import JobArgument
 
 ASSET_FOLDER = 'tests/assets/plugins'
 
@@ -35,3 +37,53 @@ class TestHash(BaseHashTest):
     klass = Plugin
 
     asset_folder = ASSET_FOLDER
+
+
+def test_sha256_after_in_place_change():
+    plugin = Plugin.from_file(f'{ASSET_FOLDER}/valid/honeybee-radiance.yaml')
+    digest = plugin.sha256
+
+    plugin.functions.pop()
+
+    assert plugin.sha256 != digest
+
+
+def test_equality_after_in_place_change():
+    plugin = Plugin.from_file(f'{ASSET_FOLDER}/valid/honeybee-radiance.yaml')
+    plugin_copy = plugin.copy(deep=True)
+
+    assert plugin == plugin_copy
+    assert hash(plugin) == hash(plugin_copy)
+
+    plugin.functions.pop()
+
+    assert plugin != plugin_copy
+
+
+def test_equal_models_hash_the_same():
+    values = [1, 1.0, True, '1']
+    arguments = [JobArgument(name='arg', value=value) for value in values]
+
+    for argument in arguments:
+        for other in arguments:
+            if argument == other:
+                assert hash(argument) == hash(other)
+
+    assert arguments[0] != arguments[1]
+    assert arguments[0] != arguments[2]
+
+
+def test_yaml_keeps_safe_dumper_untouched():
+    plugin = Plugin.from_file(f'{ASSET_FOLDER}/valid/honeybee-radiance.yaml')
+    plugin.yaml()
+
+    assert yaml.safe_dump({'b': 1, 'a': 2}) == 'a: 2\nb: 1\n'
+
+
+def test_to_dict_keeps_json_values():
+    argument = JobArgument(name='arg', value=float('nan'))
+    assert math.isnan(argument.to_dict()['value'])
+
+    argument = JobArgument(name='arg', value=2 ** 70)
+    assert argument.to_dict()['value'] == 2 ** 70
+    assert isinstance(argument.to_dict()['value'], int)
@@ -0,0 +1,97 @@
+import io
+import os
+import shutil
+from urllib import request
+from urllib.error import HTTPError
+
+import pytest
+
+from queenbee.recipe import dependency
+from queenbee.recipe.dependency import Dependency
+
+INDEX_PATH = 'tests/assets/repository/test-repo/index.json'
+LAST_MODIFIED = 'Wed, 21 Oct 2015 07:28:00 GMT'
+
+# the conftest mock reads every url from the test repository folder
+urlopen = request.urlopen
+
+
+@pytest.fixture(autouse=True)
+def index_cache(monkeypatch):
+    monkeypatch.setattr(dependency, '_INDEX_CACHE', {})
+
+
+class Response(io.BytesIO):
+
+    def __init__(self, data, headers):
+        super(Response, self).__init__(data)
+        self.headers = headers
+
+
+def _remote_dependency():
+    return Dependency(
+        kind='plugin', name='honeybee-radiance', tag='1.2.3',
+        source='https://example.com/test-repo'
+    )
+
+
+def test_remote_index_not_modified(monkeypatch):
+    with open(INDEX_PATH, 'rb') as f:
+        data = f.read()
+    requests = []
+
+    def urlopen_mock(req):
+        requests.append(req)
+        if len(requests) == 1:
+            return Response(data, {'ETag': '"v1"', 'Last-Modified': LAST_MODIFIED})
+        raise HTTPError(req.get_full_url(), 304, 'Not Modified', {}, None)
+
+    monkeypatch.setattr(request, 'urlopen', urlopen_mock)
+
+    index = _remote_dependency()._fetch_index()
+    assert _remote_dependency()._fetch_index() is index
+
+    assert requests[0].get_header('If-none-match') is None
+    assert requests[1].get_header('If-none-match') == '"v1"'
+    assert requests[1].get_header('If-modified-since') == LAST_MODIFIED
+
+
+def test_remote_index_modified(monkeypatch):
+    with open(INDEX_PATH, 'rb') as f:
+        data = f.read()
+    etags = ['"v1"', '"v2"']
+    requests = []
+
+    def urlopen_mock(req):
+        requests.append(req)
+        return Response(data, {'ETag': etags[len(requests) - 1]})
+
+    monkeypatch.setattr(request, 'urlopen', urlopen_mock)
+
+    index = _remote_dependency()._fetch_index()
+    updated = _remote_dependency()._fetch_index()
+
+    assert updated is not index
+    assert updated == index
+    assert requests[1].get_header('If-none-match') == '"v1"'
+    assert dependency._INDEX_CACHE[_remote_dependency()._index_url][0] == \
+        {'If-None-Match': '"v2"'}
+
+
+def test_local_index_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(request, 'urlopen', urlopen)
+    index_path = str(tmp_path / 'index.json')
+    shutil.copy(INDEX_PATH, index_path)
+    local_dependency = Dependency(
+        kind='plugin', name='honeybee-radiance', tag='1.2.3', source=tmp_path.as_uri()
+    )
+
+    index = local_dependency._fetch_index()
+    assert local_dependency._fetch_index() is index
+
+    stat = os.stat(index_path)
+    os.utime(index_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000))
+    updated = local_dependency._fetch_index()
+
+    assert updated is not index
+    assert updated == index
@@ -3,7 +3,16 @@ from tests.base.value_error import BaseValueErrorTest
 from tests.base.folder_test import BaseFolderTest
 from tests.base.hash_test import BaseHashTest
 
+from pathlib import Path
+from urllib import request
+
+from queenbee.plugin import Plugin
 from queenbee.recipe import Recipe
+from queenbee.recipe.dependency import Dependency
+from queenbee.repository import PackageVersion, RepositoryIndex
+
+# the conftest mock reads every url from the test repository folder
+urlopen = request.urlopen
 
 ASSET_FOLDER = 'tests/assets/recipes'
 
@@ -34,3 +43,62 @@ class TestHash(BaseHashTest):
     klass = Recipe
 
     asset_folder = ASSET_FOLDER
+
+
+def test_fetch_dependencies(tmp_path, monkeypatch):
+    monkeypatch.setattr(request, 'urlopen', urlopen)
+    repo_path = tmp_path / 'repo'
+    (repo_path / 'plugins').mkdir(parents=True)
+    plugins = {}
+    for name in ('honeybee-radiance', 'energy-plus'):
+        plugin = Plugin.from_folder(f'tests/assets/plugins/folders/{name}')
+        version, file_object = PackageVersion.package_resource(plugin)
+        (repo_path / 'plugins' / version.url).write_bytes(file_object.getvalue())
+        plugins[name] = plugin
+    RepositoryIndex.from_folder(str(repo_path)).to_json(str(repo_path / 'index.json'))
+
+    sources = [
+        repo_path.as_uri(),
+        Path('tests/assets/repository/test-repo').resolve().as_uri(),
+    ]
+    names = ['energy-plus', 'honeybee-radiance', 'honeybee-radiance', 'energy-plus']
+    recipe = Recipe.from_folder('tests/assets/recipes/folders/daylight-factor')
+    recipe.dependencies = [
+        Dependency(
+            kind='plugin', name=name, tag=plugins[name].metadata.tag,
+            source=sources[1] if i == 1 else sources[0]
+        )
+        for i, name in enumerate(names)
+    ]
+
+    index_calls = []
+    fetch_index = Dependency._fetch_index
+
+    def count_fetch_index(self, *args, **kwargs):
+        index_calls.append(self.source)
+        return fetch_index(self, *args, **kwargs)
+
+    monkeypatch.setattr(Dependency, '_fetch_index', count_fetch_index)
+
+    fetched = recipe.fetch_dependencies()
+
+    assert [version.manifest.metadata.name for version in fetched] == names
+    assert sorted(index_calls) == sorted(sources)
+
+
+def test_fetch_dependencies_latest(monkeypatch):
+    monkeypatch.setattr(request, 'urlopen', urlopen)
+    source = Path('tests/assets/repository/test-repo').resolve().as_uri()
+    index = RepositoryIndex.parse_file('tests/assets/repository/test-repo/index.json')
+    latest = index.plugin['honeybee-radiance'][-1]
+
+    recipe = Recipe.from_folder('tests/assets/recipes/folders/daylight-factor')
+    recipe.dependencies = [
+        Dependency(kind='plugin', name='honeybee-radiance', tag='latest', source=source)
+        for _ in range(2)
+    ]
+
+    fetched = recipe.fetch_dependencies()
+
+    assert [version.digest for version in fetched] == [latest.digest] * 2
+    assert [dep.digest for dep in recipe.dependencies] == [latest.digest] * 2
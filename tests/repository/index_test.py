@@ -0,0 +1,139 @@
+import os
+import shutil
+import stat
+
+import pytest
+
+from queenbee.base import basemodel
+from queenbee.base.parser import parse_file
+from queenbee.plugin import Plugin
+from queenbee.repository import RepositoryIndex
+
+INDEX_PATH = 'tests/assets/repository/test-repo/index.json'
+
+
+def test_overwrite_version_sharing_digest():
+    index = RepositoryIndex.parse_file(INDEX_PATH)
+    version = index.plugin['honeybee-radiance'][0]
+
+    retagged = version.copy(update={'tag': '9.9.9'})
+    index.index_plugin_version(retagged)
+
+    changed = version.copy(update={'tag': '9.9.9', 'digest': 'f' * 64})
+    index.index_plugin_version(changed, overwrite=True)
+
+    assert index.package_by_digest(
+        'plugin', 'honeybee-radiance', version.digest).tag == version.tag
+    assert index.package_by_digest(
+        'plugin', 'honeybee-radiance', 'f' * 64) is changed
+    assert index.package_by_tag('plugin', 'honeybee-radiance', '9.9.9') is changed
+
+
+def test_package_by_digest_first_match():
+    index = RepositoryIndex.parse_file(INDEX_PATH)
+    version = index.plugin['honeybee-radiance'][0]
+    index.index_plugin_version(version.copy(update={'tag': '9.9.9'}))
+
+    assert index.package_by_digest(
+        'plugin', 'honeybee-radiance', version.digest).tag == version.tag
+
+    with pytest.raises(ValueError):
+        index.package_by_digest('plugin', 'honeybee-radiance', '0' * 64)
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    path = str(tmp_path / 'index.json')
+    shutil.copy(INDEX_PATH, path)
+    return path
+
+
+def test_from_file_cache_hit(cache_folder, monkeypatch, index_path):
+    index = RepositoryIndex.from_file(index_path)
+    assert len(os.listdir(cache_folder / 'index')) == 1
+
+    def parse_fail(filepath):
+        raise AssertionError('index should be read from the cache')
+
+    monkeypatch.setattr(basemodel, 'parse_file', parse_fail)
+    cached = RepositoryIndex.from_file(index_path)
+
+    assert cached == index
+    assert cached is not index
+
+
+def test_from_file_cache_stale(cache_folder, index_path):
+    index = RepositoryIndex.from_file(index_path)
+    version = index.plugin['honeybee-radiance'][0]
+    index.index_plugin_version(version.copy(update={'tag': '9.9.9'}))
+    index.to_json(index_path)
+
+    updated = RepositoryIndex.from_file(index_path)
+
+    assert updated.package_by_tag('plugin', 'honeybee-radiance', '9.9.9')
+    assert len(os.listdir(cache_folder / 'index')) == 1
+
+
+def test_from_file_cache_corrupt(cache_folder, index_path):
+    RepositoryIndex.from_file(index_path)
+    for cache_file in (cache_folder / 'index').iterdir():
+        with open(cache_file, 'wb') as f:
+            f.write(b'not a pickle')
+
+    index = RepositoryIndex.from_file(index_path)
+
+    assert index == RepositoryIndex.parse_file(INDEX_PATH)
+
+
+def test_from_file_cache_not_private(cache_folder, monkeypatch, index_path):
+    RepositoryIndex.from_file(index_path)
+    (cache_folder / 'index').chmod(0o777)
+
+    parsed = []
+
+    def parse_count(filepath):
+        parsed.append(filepath)
+        return parse_file(filepath)
+
+    monkeypatch.setattr(basemodel, 'parse_file', parse_count)
+    RepositoryIndex.from_file(index_path)
+
+    assert parsed == [index_path]
+
+
+@pytest.fixture
+def repository_folder(tmp_path):
+    folder = str(tmp_path / 'test-repo')
+    shutil.copytree(os.path.dirname(INDEX_PATH), folder)
+    return folder
+
+
+def test_index_resource(repository_folder, monkeypatch):
+    index_path = os.path.join(repository_folder, 'index.json')
+    os.chmod(index_path, 0o640)
+    plugin = Plugin.from_file('tests/assets/plugins/valid/minimum.yaml')
+
+    RepositoryIndex.index_resource(repository_folder, plugin)
+
+    parsed = RepositoryIndex.parse_file(index_path)
+    assert parsed.metadata.plugin_count == 2
+    assert parsed.metadata.recipe_count == 1
+    assert parsed.plugin[plugin.metadata.name][0].slug == \
+        f'test-repo/{plugin.metadata.name}'
+
+    # the index is written in place and its cache matches the written file
+    assert sorted(os.listdir(repository_folder)) == ['index.json', 'plugins', 'recipes']
+    assert stat.S_IMODE(os.stat(index_path).st_mode) == 0o640
+
+    def parse_fail(filepath):
+        raise AssertionError('index should be read from the cache')
+
+    monkeypatch.setattr(basemodel, 'parse_file', parse_fail)
+    assert RepositoryIndex.from_file(index_path) == parsed
+
+
+def test_index_resource_license_removed(repository_folder):
+    plugin = Plugin.from_file('tests/assets/plugins/valid/minimum.yaml')
+
+    with pytest.raises(TypeError):
+        RepositoryIndex.index_resource(repository_folder, plugin, license='MIT')
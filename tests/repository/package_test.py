@@ -0,0 +1,78 @@
+import os
+from urllib import request
+
+import pytest
+
+from queenbee.plugin import Plugin
+from queenbee.repository import PackageVersion, RepositoryIndex
+
+PLUGIN_PATH = 'tests/assets/plugins/valid/honeybee-radiance.yaml'
+
+
+def test_unpack_tar_verify_digest():
+    plugin = Plugin.from_file(PLUGIN_PATH)
+    version, file_object = PackageVersion.package_resource(plugin)
+
+    file_object.seek(0)
+    unpacked = PackageVersion.unpack_tar(file_object, digest=version.digest)
+    assert unpacked.digest == plugin.sha256
+
+    file_object.seek(0)
+    with pytest.raises(ValueError):
+        PackageVersion.unpack_tar(file_object, digest='0' * 64)
+
+
+REPOSITORY_PATH = 'tests/assets/repository/test-repo'
+REPOSITORY_URL = 'https://example.com/test-repo'
+
+
+@pytest.fixture
+def package_version():
+    index = RepositoryIndex.parse_file(os.path.join(REPOSITORY_PATH, 'index.json'))
+    return index.plugin['honeybee-radiance'][0]
+
+
+def test_fetch_package_cache_hit(cache_folder, monkeypatch, package_version):
+    version = package_version.fetch_package(REPOSITORY_URL)
+    assert version.digest == package_version.digest
+    cache_path = cache_folder / 'packages' / f'{package_version.digest}.tgz'
+    with open(cache_path, 'rb') as f, \
+            open(os.path.join(REPOSITORY_PATH, package_version.url), 'rb') as package:
+        assert f.read() == package.read()
+
+    def urlopen_fail(req):
+        raise AssertionError('package should be read from the cache')
+
+    monkeypatch.setattr(request, 'urlopen', urlopen_fail)
+    version = package_version.fetch_package(REPOSITORY_URL)
+    assert version.digest == package_version.digest
+
+
+@pytest.mark.parametrize('content', [b'not a tar file', 'other-package'])
+def test_fetch_package_bad_cache(cache_folder, package_version, content):
+    cache_path = cache_folder / 'packages' / f'{package_version.digest}.tgz'
+    cache_path.parent.mkdir(parents=True)
+    if content == 'other-package':
+        # a valid package whose resource.json does not match the cached digest
+        plugin = Plugin.from_file('tests/assets/plugins/valid/minimum.yaml')
+        _, file_object = PackageVersion.package_resource(plugin)
+        content = file_object.getvalue()
+    with open(cache_path, 'wb') as f:
+        f.write(content)
+
+    version = package_version.fetch_package(REPOSITORY_URL)
+
+    assert version.digest == package_version.digest
+    with open(cache_path, 'rb') as f, \
+            open(os.path.join(REPOSITORY_PATH, package_version.url), 'rb') as package:
+        assert f.read() == package.read()
+
+
+def test_fetch_package_not_cached(cache_folder, package_version):
+    unverified = package_version.copy(update={'digest': '0' * 64})
+    unverified.fetch_package(REPOSITORY_URL, verify_digest=False)
+
+    invalid = package_version.copy(update={'digest': '../package'})
+    invalid.fetch_package(REPOSITORY_URL, verify_digest=False)
+
+    assert os.listdir(cache_folder / 'packages') == []